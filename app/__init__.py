@@ -6,15 +6,18 @@ with all necessary extensions, blueprints, and configuration.
 It configures the Flask app, initializes extensions, and registers all route blueprints.
 """
 
+import json
 import logging
 import os
 
-from flask import Flask, request, current_app
+from flask import Flask, Response, request, current_app
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 from flask_socketio import SocketIO
+from sqlalchemy import event
+from app.utils.sqlite_pragmas import set_sqlite_pragmas
 from config import config_by_name
 
 db = SQLAlchemy()
@@ -22,6 +25,11 @@ migrate = Migrate()
 jwt = JWTManager()
 socketio = SocketIO()
 
+# The health payload never changes, so serialize it once at import time.
+_HEALTH_BODY = json.dumps({"status": "healthy", "version": "1.0.0"}).encode()
+
+# Endpoints not worth a log line: static files and unmatched URLs
+_LOG_SKIP_ENDPOINTS = frozenset({"static", None})
 
 def create_app(config_name="development"):
     """
@@ -34,10 +42,16 @@ def create_app(config_name="development"):
         Flask: Configured Flask application instance with all extensions and routes registered.
     """
     app = Flask(__name__)
-    app.config.from_object(config_by_name[config_name])
+    config_class = config_by_name[config_name]
+    app.config.from_object(config_class)
+    config_class.warn_if_default_keys()
 
     # Initialize extensions
     db.init_app(app)
+    with app.app_context():
+        # Tune only this app's engine, not every engine in the process
+        if db.engine.dialect.name == "sqlite":
+            event.listen(db.engine, "connect", set_sqlite_pragmas)
     migrate.init_app(app, db, render_as_batch=True)
     jwt.init_app(app)
     socketio.init_app(app, cors_allowed_origins="*", async_mode='threading')
@@ -95,12 +109,17 @@ def create_app(config_name="development"):
     @app.route("/health")
     def health_check():
         """Health check endpoint for monitoring application status."""
-        return {"status": "healthy", "version": "1.0.0"}
+        return Response(_HEALTH_BODY, mimetype="application/json")
 
     # Request logging
     @app.before_request
     def log_request():
         """Log incoming requests for debugging and monitoring."""
-        logging.info("%s %s", request.method, request.url)
+        # Bail out before touching the request when INFO is filtered out
+        if not logging.getLogger().isEnabledFor(logging.INFO):
+            return
+        if request.endpoint in _LOG_SKIP_ENDPOINTS:
+            return
+        logging.info("%s %s", request.method, request.path)
 
     return app
\ No newline at end of file
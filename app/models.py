@@ -326,7 +326,15 @@ class StockAdjustment(db.Model):
     change_amount = db.Column(db.Float, nullable=False)
     reason = db.Column(db.String(255), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, index=True)
+
+    __table_args__ = (
+        db.Index(
+            "ix_stockadjustments_ingredient_id_created_at",
+            "ingredient_id",
+            "created_at",
+        ),
+    )
 
 class StockInvoice(db.Model):
     __tablename__ = "stockinvoices"
@@ -0,0 +1,20 @@
+"""SQLite connection tuning shared by the app and standalone database scripts."""
+
+# Per-connection SQLite tuning: WAL lets readers run alongside the writer and
+# NORMAL sync is safe under WAL while avoiding an fsync on every commit. A
+# 64 MB page cache and memory-mapped reads keep the hot POS tables in memory.
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-64000",
+    "mmap_size=268435456",
+)
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLITE_PRAGMAS to a new connection; use as an engine "connect" listener."""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
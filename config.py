@@ -63,5 +63,4 @@ def get_config_name():
     """Get the configuration name from environment."""
     return os.getenv("FLASK_CONFIG", "default")
 
-current_config = config_by_name[get_config_name()]
-current_config.warn_if_default_keys()
\ No newline at end of file
+current_config = config_by_name[get_config_name()]
\ No newline at end of file
@@ -37,12 +37,18 @@ def init_database():
     """Initialize database with tables and default data."""
     app = create_app()
     with app.app_context():
-        # Drop all tables and recreate them
-        db.drop_all()
+        # Only drop existing tables when a reset is explicitly requested;
+        # create_all is a no-op for tables that already exist.
+        if os.getenv("INIT_DB_RESET") == "1":
+            db.drop_all()
         db.create_all()
 
         print("Database tables created successfully!")
 
+        if User.query.filter_by(username="manager").first():
+            print("Default data already present. Set INIT_DB_RESET=1 to recreate it.")
+            return
+
         # Create a default manager user
         manager = User(
             username="manager",
@@ -79,23 +85,15 @@ def init_database():
         )
         courier.set_password("password123")
 
-        # Add users to database
-        db.session.add(manager)
-        db.session.add(cashier)
-        db.session.add(barista)
-        db.session.add(courier)
-
         # Create some default categories
         beverages = Category(name="Beverages", sort_order=1)
         food = Category(name="Food", sort_order=2)
         desserts = Category(name="Desserts", sort_order=3)
 
-        db.session.add(beverages)
-        db.session.add(food)
-        db.session.add(desserts)
+        db.session.add_all([manager, cashier, barista, courier, beverages, food, desserts])
 
-        # Commit to get IDs
-        db.session.commit()
+        # Flush to get category IDs without ending the transaction
+        db.session.flush()
 
         # Create some sample menu items
         coffee = MenuItem(
@@ -122,13 +120,6 @@ def init_database():
             is_active=True,
         )
 
-        db.session.add(coffee)
-        db.session.add(sandwich)
-        db.session.add(cake)
-
-        # Commit to get menu item IDs
-        db.session.commit()
-
         # Create some sample ingredients
         coffee_beans = Ingredient(
             name="Coffee Beans", unit="kg", current_stock=10.0, min_stock_alert=2.0
@@ -140,10 +131,6 @@ def init_database():
             name="Flour", unit="kg", current_stock=5.0, min_stock_alert=1.0
         )
 
-        db.session.add(coffee_beans)
-        db.session.add(bread)
-        db.session.add(flour)
-
         # Create some sample discounts
         happy_hour = Discount(
             name="Happy Hour",
@@ -154,26 +141,41 @@ def init_database():
             is_active=True,
         )
 
-        db.session.add(happy_hour)
-
         # Create some system settings
         exchange_rate = SystemSettings(
             setting_key="exchange_rate", setting_value="89000"
         )
         currency = SystemSettings(setting_key="currency", setting_value="LBP")
 
-        db.session.add(exchange_rate)
-        db.session.add(currency)
+        db.session.add_all(
+            [
+                coffee,
+                sandwich,
+                cake,
+                coffee_beans,
+                bread,
+                flour,
+                happy_hour,
+                exchange_rate,
+                currency,
+            ]
+        )
 
-        # Final commit
+        # Read the usernames now; commit() expires the instances and reading
+        # them afterwards would reload each user from the database
+        usernames = [user.username for user in (manager, cashier, barista, courier)]
+
+        # Single commit for all seed data
         db.session.commit()
 
-        print("Sample data created successfully!")
-        print("\nDefault users created:")
-        print("- Username: manager, Password: password123")
-        print("- Username: cashier, Password: password123")
-        print("- Username: barista, Password: password123")
-        print("- Username: courier, Password: password123")
+        print(
+            "Sample data created successfully!\n"
+            "\nDefault users created:\n"
+            + "\n".join(
+                f"- Username: {username}, Password: password123"
+                for username in usernames
+            )
+        )
 
 
 if __name__ == "__main__":
@@ -1,11 +1,28 @@
 import requests, json, sys
-login=requests.post('http://localhost:5000/api/v1/auth/login', json={'username':'manager','password':'manager123'})
-print('login',login.status_code, login.text)
-if login.ok:
+from requests.adapters import HTTPAdapter
+
+# (connect, read) seconds; a down server fails on connect instead of hanging
+TIMEOUT=(1.0, 5.0)
+
+def smoke(base_url='http://localhost:5000'):
+    s=requests.Session()
+    s.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+    try:
+        login=s.post(f'{base_url}/api/v1/auth/login', json={'username':'manager','password':'manager123'}, timeout=TIMEOUT)
+    except requests.exceptions.ConnectionError as e:
+        print('server unreachable', e)
+        return False
+    print('login',login.status_code, login.text)
+    if not login.ok:
+        return False
     token=login.json()['access_token']
     print('token', token[:50], '...')
-    r=requests.get('http://localhost:5000/api/v1/menu/active', headers={'Authorization': f'Bearer {token}'})
+    s.headers['Authorization']=f'Bearer {token}'
+    r=s.get(f'{base_url}/api/v1/menu/active', timeout=TIMEOUT)
     print('menu', r.status_code)
     print(r.text[:1000])
-else:
-    sys.exit(1)
+    return True
+
+if __name__ == '__main__':
+    if not smoke():
+        sys.exit(1)
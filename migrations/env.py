@@ -2,13 +2,14 @@
 
 This module configures Alembic for database migrations.
 """
+import logging
 import os
 import sys
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
-from flask import current_app
+from flask import current_app, has_app_context
 
 # Add the parent directory to the Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,9 +24,10 @@ from alembic import context
 
 config = context.config
 
-# Interpret the config file for Python logging.
-# This line sets up loggers basically.
-fileConfig(config.config_file_name)
+# Interpret the config file for Python logging, unless the host process
+# (e.g. the Flask app running `migrate-db`) has already configured it.
+if config.config_file_name is not None and not logging.getLogger().handlers:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 target_metadata = db.Model.metadata
 
@@ -55,8 +57,8 @@ def run_migrations_online():
     In this scenario we need to create an Engine
     and associate a connection with the context.
     """
-    # Create the Flask app
-    app = create_app()
+    # Reuse the running Flask app (flask db / migrate-db) when there is one
+    app = current_app._get_current_object() if has_app_context() else create_app()
 
     # Connect to the database using the app's configuration
     with app.app_context():
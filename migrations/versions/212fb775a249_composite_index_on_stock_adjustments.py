@@ -0,0 +1,43 @@
+"""Composite index on stock adjustments
+
+Revision ID: 212fb775a249
+Revises: 8d351cc2dd91
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '212fb775a249'
+down_revision = '8d351cc2dd91'
+branch_labels = None
+depends_on = None
+
+
+def _index_names():
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes('stockadjustments')}
+
+
+def upgrade():
+    # The stock adjustment report filters on ingredient_id and a created_at
+    # range together; one composite index serves both predicates in a single
+    # traversal. Its leading column also covers ingredient_id-only lookups,
+    # so the single-column index is redundant. Databases built with
+    # db.create_all() may already match the model, so check first.
+    existing = _index_names()
+    if 'ix_stockadjustments_ingredient_id_created_at' not in existing:
+        op.create_index(
+            'ix_stockadjustments_ingredient_id_created_at',
+            'stockadjustments',
+            ['ingredient_id', 'created_at'],
+            unique=False,
+        )
+    if 'ix_stockadjustments_ingredient_id' in existing:
+        op.drop_index('ix_stockadjustments_ingredient_id', table_name='stockadjustments')
+
+
+def downgrade():
+    op.create_index('ix_stockadjustments_ingredient_id', 'stockadjustments', ['ingredient_id'], unique=False)
+    op.drop_index('ix_stockadjustments_ingredient_id_created_at', table_name='stockadjustments')
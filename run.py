@@ -4,84 +4,143 @@ Main entry point for the Cafe24 POS Flask application.
 This module sets up the Flask application with CLI commands for database management
 and provides the development server entry point.
 """
+import functools
 import os
 import logging
+import tempfile
 
-from flask import request
+try:
+    import fcntl
+except ImportError:  # Windows has no fcntl; migrations then run unlocked
+    fcntl = None
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
 from flask_migrate import Migrate, upgrade
+from sqlalchemy import inspect
 
 from app import create_app, db, socketio
 
 # Set up basic logging to console
 logging.basicConfig(level=logging.INFO)
 
-app = create_app()
+MIGRATE_LOCK_PATH = os.path.join(tempfile.gettempdir(), "cafe24-migrate.lock")
+
+# Pre-encoded body for the generic 500 response
+INTERNAL_ERROR_BODY = b'{"message": "Internal server error"}'
 
-@app.cli.command("create-db")
+@click.command("create-db")
+@with_appcontext
 def create_db_command():
     """Create the database tables."""
-    with app.app_context():
-        db.create_all()
+    with db.engine.begin() as conn:
+        # On an empty database skip the per-table existence checks
+        has_tables = bool(inspect(conn).get_table_names())
+        db.metadata.create_all(bind=conn, checkfirst=has_tables)
     print("Database tables created.")
 
-@app.cli.command("seed-db")
+@click.command("seed-db")
+@with_appcontext
 def seed_db_command():
     """Seed the database with initial data for v0.1."""
-    with app.app_context():
-        from werkzeug.security import generate_password_hash
-        from app.models import SystemSettings, User
-
-        # Seed System Settings
-        if not SystemSettings.query.filter_by(setting_key="usd_to_lbp_exchange_rate").first():
-            db.session.add(SystemSettings(setting_key="usd_to_lbp_exchange_rate", setting_value="90000"))
-        if not SystemSettings.query.filter_by(setting_key="primary_currency_code").first():
-            db.session.add(SystemSettings(setting_key="primary_currency_code", setting_value="LBP"))
-        if not SystemSettings.query.filter_by(setting_key="secondary_currency_code").first():
-            db.session.add(SystemSettings(setting_key="secondary_currency_code", setting_value="USD"))
-
-        print("System settings seeded.")
-
-        # Seed Users
-        users_to_seed = [
-            {"username": "manager1", "password": "password123", "full_name": "Manager One", "role": "manager"},
-            {"username": "courier1", "password": "password123", "full_name": "Courier One", "role": "courier"},
-            {"username": "barista1", "password": "password123", "full_name": "Barista One", "role": "barista"},
-            {"username": "cashier1", "password": "password123", "full_name": "Cashier One", "role": "cashier"},
-        ]
-        for user_data in users_to_seed:
-            if not User.query.filter_by(username=user_data["username"]).first():
-                user = User(
-                    username=user_data["username"],
-                    full_name=user_data["full_name"],
-                    role=user_data["role"],
-                )
-                user.set_password(user_data["password"])
-                db.session.add(user)
-
-        print("Users seeded.")
-        print("Menu data seeding placeholder - implement actual data.")
-
-        db.session.commit()
+    from werkzeug.security import generate_password_hash
+    from app.models import SystemSettings, User
+
+    # Seed System Settings
+    settings_to_seed = [
+        ("usd_to_lbp_exchange_rate", "90000"),
+        ("primary_currency_code", "LBP"),
+        ("secondary_currency_code", "USD"),
+    ]
+    existing_keys = set(db.session.scalars(db.select(SystemSettings.setting_key)))
+    db.session.add_all(
+        SystemSettings(setting_key=key, setting_value=value)
+        for key, value in settings_to_seed
+        if key not in existing_keys
+    )
+
+    print("System settings seeded.")
+
+    # Seed Users
+    users_to_seed = [
+        {"username": "manager1", "password": "password123", "full_name": "Manager One", "role": "manager"},
+        {"username": "courier1", "password": "password123", "full_name": "Courier One", "role": "courier"},
+        {"username": "barista1", "password": "password123", "full_name": "Barista One", "role": "barista"},
+        {"username": "cashier1", "password": "password123", "full_name": "Cashier One", "role": "cashier"},
+    ]
+    existing_usernames = set(
+        db.session.scalars(
+            db.select(User.username).where(
+                User.username.in_([u["username"] for u in users_to_seed])
+            )
+        )
+    )
+    new_users = [u for u in users_to_seed if u["username"] not in existing_usernames]
+    # Hashing is deliberately slow, so hash each distinct password only once
+    password_hashes = {
+        password: generate_password_hash(password)
+        for password in {u["password"] for u in new_users}
+    }
+    for user_data in new_users:
+        user = User(
+            username=user_data["username"],
+            full_name=user_data["full_name"],
+            role=user_data["role"],
+        )
+        user.hashed_password = password_hashes[user_data["password"]]
+        db.session.add(user)
+
+    print("Users seeded.")
+    print("Menu data seeding placeholder - implement actual data.")
+
+    db.session.commit()
     print("Database seeded with initial v0.1 data.")
 
-@app.cli.command("migrate-db")
+@click.command("migrate-db")
+@with_appcontext
 def migrate_db_command():
     """Migrate database schema."""
-    Migrate(app, db)
-    upgrade()
+    # Only one process (e.g. one of several Gunicorn workers booting together)
+    # runs the upgrade; the others skip instead of racing on alembic_version.
+    with open(MIGRATE_LOCK_PATH, "w", encoding="utf-8") as lock_file:
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                print("Migration already in progress in another process, skipping.")
+                return
+        Migrate(current_app._get_current_object(), db)
+        upgrade()
+
+
+@functools.lru_cache(maxsize=1)
+def get_app():
+    """Create the Flask app on first use and attach the CLI commands."""
+    app = create_app()
+    app.cli.add_command(create_db_command)
+    app.cli.add_command(seed_db_command)
+    app.cli.add_command(migrate_db_command)
+    return app
+
+
+def __getattr__(name):
+    """Resolve ``run.app`` lazily for the flask CLI and ``gunicorn run:app``."""
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == "__main__":
-    # Log all requests and errors
-    @app.before_request
-    def log_request_info():
-        """Log incoming request information."""
-        logging.info("Request: %s %s", request.method, request.url)
+    app = get_app()
 
+    # Log unhandled errors; requests are already logged by create_app()
     @app.errorhandler(Exception)
     def handle_exception(e):
         """Handle unhandled exceptions."""
         logging.exception("Unhandled Exception: %s", e)
-        return {"message": "Internal server error"}, 500
+        # A fresh Response per error: after_request hooks (CORS) mutate headers
+        return app.response_class(INTERNAL_ERROR_BODY, status=500, mimetype="application/json")
 
     try:
         # Use SocketIO to run the app for WebSocket support
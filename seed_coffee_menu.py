@@ -4,263 +4,217 @@ Coffee Shop Menu Data Seeder
 Adds realistic coffee shop menu items, categories, and ingredients for testing.
 """
 
+import os
+import sys
+
 from app import create_app, db
 from app.models import Category, MenuItem, Ingredient
 from decimal import Decimal
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+
+CATEGORIES = [
+    {"name": "Hot Coffee", "sort_order": 1},
+    {"name": "Cold Coffee", "sort_order": 2},
+    {"name": "Tea & Hot Drinks", "sort_order": 3},
+    {"name": "Pastries & Snacks", "sort_order": 4},
+    {"name": "Breakfast", "sort_order": 5},
+]
+
+INGREDIENTS = [
+    {"name": "Coffee Beans", "unit": "g", "current_stock": 5000.0, "min_stock_alert": 500.0, "cost_per_unit_usd": Decimal("0.02")},
+    {"name": "Milk", "unit": "ml", "current_stock": 10000.0, "min_stock_alert": 1000.0, "cost_per_unit_usd": Decimal("0.001")},
+    {"name": "Sugar", "unit": "g", "current_stock": 2000.0, "min_stock_alert": 200.0, "cost_per_unit_usd": Decimal("0.002")},
+    {"name": "Vanilla Syrup", "unit": "ml", "current_stock": 1000.0, "min_stock_alert": 100.0, "cost_per_unit_usd": Decimal("0.01")},
+    {"name": "Caramel Syrup", "unit": "ml", "current_stock": 1000.0, "min_stock_alert": 100.0, "cost_per_unit_usd": Decimal("0.01")},
+    {"name": "Chocolate Powder", "unit": "g", "current_stock": 500.0, "min_stock_alert": 50.0, "cost_per_unit_usd": Decimal("0.05")},
+    {"name": "Whipped Cream", "unit": "ml", "current_stock": 500.0, "min_stock_alert": 50.0, "cost_per_unit_usd": Decimal("0.02")},
+    {"name": "Ice", "unit": "g", "current_stock": 5000.0, "min_stock_alert": 500.0, "cost_per_unit_usd": Decimal("0.001")},
+    {"name": "Tea Leaves", "unit": "g", "current_stock": 1000.0, "min_stock_alert": 100.0, "cost_per_unit_usd": Decimal("0.03")},
+    {"name": "Croissant", "unit": "piece", "current_stock": 50.0, "min_stock_alert": 5.0, "cost_per_unit_usd": Decimal("1.50")},
+]
+
+MENU_ITEMS = [
+    # (category, name, description, base_price_usd)
+    # Hot Coffee
+    ("Hot Coffee", "Espresso", "Rich and bold single shot of espresso", Decimal("2.50")),
+    ("Hot Coffee", "Doppio", "Double shot of espresso for the coffee lover", Decimal("3.50")),
+    ("Hot Coffee", "Lungo", "Long extraction espresso with more water", Decimal("3.00")),
+    ("Hot Coffee", "Ristretto", "Short extraction espresso, concentrated and intense", Decimal("3.00")),
+    ("Hot Coffee", "Americano", "Espresso diluted with hot water", Decimal("3.25")),
+    ("Hot Coffee", "Cappuccino", "Espresso with steamed milk and foam", Decimal("4.50")),
+    ("Hot Coffee", "Latte", "Espresso with steamed milk and light foam", Decimal("4.75")),
+    ("Hot Coffee", "Macchiato", "Espresso 'marked' with a dollop of steamed milk", Decimal("4.25")),
+    ("Hot Coffee", "Mocha", "Espresso with chocolate, steamed milk and whipped cream", Decimal("5.25")),
+    ("Hot Coffee", "Flat White", "Double espresso with steamed milk, no foam", Decimal("4.50")),
+
+    # Cold Coffee
+    ("Cold Coffee", "Iced Americano", "Espresso with cold water and ice", Decimal("3.50")),
+    ("Cold Coffee", "Iced Latte", "Espresso with cold milk and ice", Decimal("5.00")),
+    ("Cold Coffee", "Cold Brew", "Slow-steeped coffee served over ice", Decimal("4.25")),
+    ("Cold Coffee", "Frappé", "Blended iced coffee with milk and sugar", Decimal("5.50")),
+
+    # Tea & Hot Drinks
+    ("Tea & Hot Drinks", "English Breakfast Tea", "Classic black tea blend", Decimal("2.75")),
+    ("Tea & Hot Drinks", "Earl Grey Tea", "Black tea with bergamot oil", Decimal("2.75")),
+    ("Tea & Hot Drinks", "Hot Chocolate", "Rich chocolate drink with whipped cream", Decimal("4.00")),
+
+    # Pastries & Snacks
+    ("Pastries & Snacks", "Butter Croissant", "Fresh baked buttery croissant", Decimal("3.50")),
+    ("Pastries & Snacks", "Pain au Chocolat", "Croissant with dark chocolate", Decimal("4.00")),
+    ("Pastries & Snacks", "Blueberry Muffin", "Fresh blueberry muffin", Decimal("3.25")),
+
+    # Breakfast
+    ("Breakfast", "Avocado Toast", "Smashed avocado on sourdough bread", Decimal("8.50")),
+    ("Breakfast", "Breakfast Sandwich", "Egg, cheese, and bacon on English muffin", Decimal("7.75")),
+]
+
+# Dialects with INSERT ... ON CONFLICT DO NOTHING; others (e.g. MySQL) fall
+# back to checking for existing rows first
+ON_CONFLICT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+def insert_ignoring_duplicates(table, index_elements):
+    """Build an INSERT for table that skips rows violating the given unique key.
+
+    Callers add RETURNING to learn which rows were created, so this returns
+    None when the dialect lacks either ON CONFLICT DO NOTHING or multi-row
+    RETURNING (MySQL, SQLite before 3.35).
+    """
+    dialect_insert = ON_CONFLICT_INSERTS.get(db.engine.dialect.name)
+    if dialect_insert is None or not db.engine.dialect.insert_executemany_returning:
+        return None
+    return dialect_insert(table).on_conflict_do_nothing(index_elements=index_elements)
 
 def main():
     app = create_app()
     with app.app_context():
         print("Starting coffee shop menu seeding...")
+        # Per-row details are buffered and only written when SEED_VERBOSE is set
+        details = []
         
-        # Create Categories
-        categories_data = [
-            {"name": "Hot Coffee", "sort_order": 1},
-            {"name": "Cold Coffee", "sort_order": 2},
-            {"name": "Tea & Hot Drinks", "sort_order": 3},
-            {"name": "Pastries & Snacks", "sort_order": 4},
-            {"name": "Breakfast", "sort_order": 5},
-        ]
-        
-        categories = {}
-        for cat_data in categories_data:
-            existing = Category.query.filter_by(name=cat_data["name"]).first()
-            if not existing:
-                category = Category(name=cat_data["name"], sort_order=cat_data["sort_order"])
-                db.session.add(category)
-                db.session.flush()  # To get the ID
-                categories[cat_data["name"]] = category
-                print(f"Created category: {cat_data['name']}")
-            else:
-                categories[cat_data["name"]] = existing
-                print(f"Category already exists: {cat_data['name']}")
-        
-        # Create Ingredients
-        ingredients_data = [
-            {"name": "Coffee Beans", "unit": "g", "current_stock": 5000.0, "min_stock_alert": 500.0, "cost_per_unit_usd": 0.02},
-            {"name": "Milk", "unit": "ml", "current_stock": 10000.0, "min_stock_alert": 1000.0, "cost_per_unit_usd": 0.001},
-            {"name": "Sugar", "unit": "g", "current_stock": 2000.0, "min_stock_alert": 200.0, "cost_per_unit_usd": 0.002},
-            {"name": "Vanilla Syrup", "unit": "ml", "current_stock": 1000.0, "min_stock_alert": 100.0, "cost_per_unit_usd": 0.01},
-            {"name": "Caramel Syrup", "unit": "ml", "current_stock": 1000.0, "min_stock_alert": 100.0, "cost_per_unit_usd": 0.01},
-            {"name": "Chocolate Powder", "unit": "g", "current_stock": 500.0, "min_stock_alert": 50.0, "cost_per_unit_usd": 0.05},
-            {"name": "Whipped Cream", "unit": "ml", "current_stock": 500.0, "min_stock_alert": 50.0, "cost_per_unit_usd": 0.02},
-            {"name": "Ice", "unit": "g", "current_stock": 5000.0, "min_stock_alert": 500.0, "cost_per_unit_usd": 0.001},
-            {"name": "Tea Leaves", "unit": "g", "current_stock": 1000.0, "min_stock_alert": 100.0, "cost_per_unit_usd": 0.03},
-            {"name": "Croissant", "unit": "piece", "current_stock": 50.0, "min_stock_alert": 5.0, "cost_per_unit_usd": 1.50},
-        ]
+        # All three phases run in one transaction, committed on exit. Inserts
+        # target the Core tables: no model hooks are registered, so the ORM
+        # unit of work would only add identity-map and event overhead.
+        with db.session.begin():
+            # Create Categories
+            category_names = [cat_data["name"] for cat_data in CATEGORIES]
+            # Menu items only need the category IDs, so keep {name: id}
+            categories = dict(
+                db.session.execute(
+                    select(Category.name, Category.id).where(Category.name.in_(category_names))
+                ).all()
+            )
+            new_categories = [cat_data for cat_data in CATEGORIES if cat_data["name"] not in categories]
+            for cat_data in CATEGORIES:
+                if cat_data["name"] in categories:
+                    details.append(f"Category already exists: {cat_data['name']}")
+            if new_categories:
+                if db.engine.dialect.insert_executemany_returning:
+                    # RETURNING hands back the generated IDs in the same round-trip
+                    created_categories = db.session.execute(
+                        insert(Category.__table__).returning(Category.name, Category.id),
+                        new_categories,
+                    ).all()
+                else:
+                    # e.g. MySQL: no RETURNING, so read the new IDs back
+                    db.session.execute(insert(Category.__table__), new_categories)
+                    created_categories = db.session.execute(
+                        select(Category.name, Category.id).where(
+                            Category.name.in_([cat_data["name"] for cat_data in new_categories])
+                        )
+                    ).all()
+                for name, category_id in created_categories:
+                    categories[name] = category_id
+                    details.append(f"Created category: {name}")
         
-        ingredients = {}
-        for ing_data in ingredients_data:
-            existing = Ingredient.query.filter_by(name=ing_data["name"]).first()
-            if not existing:
-                ingredient = Ingredient()
-                ingredient.name = ing_data["name"]
-                ingredient.unit = ing_data["unit"]
-                ingredient.current_stock = ing_data["current_stock"]
-                ingredient.min_stock_alert = ing_data["min_stock_alert"]
-                ingredient.cost_per_unit_usd = Decimal(str(ing_data["cost_per_unit_usd"]))
-                ingredient.is_active = True
-                db.session.add(ingredient)
-                db.session.flush()
-                ingredients[ing_data["name"]] = ingredient
-                print(f"Created ingredient: {ing_data['name']}")
+            # Create Ingredients
+            # Ingredient names are unique, so let the database skip the ones that
+            # already exist instead of checking for them first
+            ingredient_rows = [{**ing_data, "is_active": True} for ing_data in INGREDIENTS]
+            ingredient_insert = insert_ignoring_duplicates(Ingredient.__table__, ["name"])
+            if ingredient_insert is not None:
+                created_ingredients = set(
+                    db.session.execute(
+                        ingredient_insert.returning(Ingredient.name), ingredient_rows
+                    ).scalars()
+                )
             else:
-                ingredients[ing_data["name"]] = existing
-                print(f"Ingredient already exists: {ing_data['name']}")
-        
-        # Create Menu Items
-        menu_items_data = [
-            # Hot Coffee
-            {
-                "category": "Hot Coffee",
-                "name": "Espresso",
-                "description": "Rich and bold single shot of espresso",
-                "base_price_usd": 2.50,
-                "image_url": None
-            },
-            {
-                "category": "Hot Coffee", 
-                "name": "Doppio",
-                "description": "Double shot of espresso for the coffee lover",
-                "base_price_usd": 3.50,
-                "image_url": None
-            },
-            {
-                "category": "Hot Coffee",
-                "name": "Lungo",
-                "description": "Long extraction espresso with more water",
-                "base_price_usd": 3.00,
-                "image_url": None
-            },
-            {
-                "category": "Hot Coffee",
-                "name": "Ristretto",
-                "description": "Short extraction espresso, concentrated and intense",
-                "base_price_usd": 3.00,
-                "image_url": None
-            },
-            {
-                "category": "Hot Coffee",
-                "name": "Americano", 
-                "description": "Espresso diluted with hot water",
-                "base_price_usd": 3.25,
-                "image_url": None
-            },
-            {
-                "category": "Hot Coffee",
-                "name": "Cappuccino",
-                "description": "Espresso with steamed milk and foam",
-                "base_price_usd": 4.50,
-                "image_url": None
-            },
-            {
-                "category": "Hot Coffee",
-                "name": "Latte",
-                "description": "Espresso with steamed milk and light foam",
-                "base_price_usd": 4.75,
-                "image_url": None
-            },
-            {
-                "category": "Hot Coffee",
-                "name": "Macchiato",
-                "description": "Espresso 'marked' with a dollop of steamed milk",
-                "base_price_usd": 4.25,
-                "image_url": None
-            },
-            {
-                "category": "Hot Coffee",
-                "name": "Mocha",
-                "description": "Espresso with chocolate, steamed milk and whipped cream",
-                "base_price_usd": 5.25,
-                "image_url": None
-            },
-            {
-                "category": "Hot Coffee",
-                "name": "Flat White",
-                "description": "Double espresso with steamed milk, no foam",
-                "base_price_usd": 4.50,
-                "image_url": None
-            },
-            
-            # Cold Coffee
-            {
-                "category": "Cold Coffee",
-                "name": "Iced Americano",
-                "description": "Espresso with cold water and ice",
-                "base_price_usd": 3.50,
-                "image_url": None
-            },
-            {
-                "category": "Cold Coffee",
-                "name": "Iced Latte", 
-                "description": "Espresso with cold milk and ice",
-                "base_price_usd": 5.00,
-                "image_url": None
-            },
-            {
-                "category": "Cold Coffee",
-                "name": "Cold Brew",
-                "description": "Slow-steeped coffee served over ice",
-                "base_price_usd": 4.25,
-                "image_url": None
-            },
-            {
-                "category": "Cold Coffee",
-                "name": "Frappé",
-                "description": "Blended iced coffee with milk and sugar",
-                "base_price_usd": 5.50,
-                "image_url": None
-            },
-            
-            # Tea & Hot Drinks
-            {
-                "category": "Tea & Hot Drinks",
-                "name": "English Breakfast Tea",
-                "description": "Classic black tea blend",
-                "base_price_usd": 2.75,
-                "image_url": None
-            },
-            {
-                "category": "Tea & Hot Drinks", 
-                "name": "Earl Grey Tea",
-                "description": "Black tea with bergamot oil",
-                "base_price_usd": 2.75,
-                "image_url": None
-            },
-            {
-                "category": "Tea & Hot Drinks",
-                "name": "Hot Chocolate",
-                "description": "Rich chocolate drink with whipped cream",
-                "base_price_usd": 4.00,
-                "image_url": None
-            },
-            
-            # Pastries & Snacks
-            {
-                "category": "Pastries & Snacks",
-                "name": "Butter Croissant",
-                "description": "Fresh baked buttery croissant",
-                "base_price_usd": 3.50,
-                "image_url": None
-            },
-            {
-                "category": "Pastries & Snacks",
-                "name": "Pain au Chocolat",
-                "description": "Croissant with dark chocolate",
-                "base_price_usd": 4.00,
-                "image_url": None
-            },
-            {
-                "category": "Pastries & Snacks",
-                "name": "Blueberry Muffin",
-                "description": "Fresh blueberry muffin",
-                "base_price_usd": 3.25,
-                "image_url": None
-            },
-            
-            # Breakfast
-            {
-                "category": "Breakfast",
-                "name": "Avocado Toast",
-                "description": "Smashed avocado on sourdough bread",
-                "base_price_usd": 8.50,
-                "image_url": None
-            },
-            {
-                "category": "Breakfast",
-                "name": "Breakfast Sandwich",
-                "description": "Egg, cheese, and bacon on English muffin",
-                "base_price_usd": 7.75,
-                "image_url": None
-            }
-        ]
+                existing_ingredients = set(
+                    db.session.execute(
+                        select(Ingredient.name).where(
+                            Ingredient.name.in_([row["name"] for row in ingredient_rows])
+                        )
+                    ).scalars()
+                )
+                new_ingredients = [
+                    row for row in ingredient_rows if row["name"] not in existing_ingredients
+                ]
+                if new_ingredients:
+                    db.session.execute(insert(Ingredient.__table__), new_ingredients)
+                created_ingredients = {row["name"] for row in new_ingredients}
+            for ing_data in INGREDIENTS:
+                if ing_data["name"] in created_ingredients:
+                    details.append(f"Created ingredient: {ing_data['name']}")
+                else:
+                    details.append(f"Ingredient already exists: {ing_data['name']}")
         
-        for item_data in menu_items_data:
-            category = categories[item_data["category"]]
-            existing = MenuItem.query.filter_by(
-                category_id=category.id, 
-                name=item_data["name"]
-            ).first()
-            
-            if not existing:
-                menu_item = MenuItem()
-                menu_item.category_id = category.id
-                menu_item.name = item_data["name"]
-                menu_item.description = item_data["description"]
-                menu_item.base_price_usd = Decimal(str(item_data["base_price_usd"]))
-                menu_item.is_active = True
-                menu_item.image_url = item_data["image_url"]
-                db.session.add(menu_item)
-                print(f"Created menu item: {item_data['name']} (${item_data['base_price_usd']})")
+            # Create Menu Items
+            # Menu item names are unique per category, so the same duplicate
+            # skip applies on (category_id, name)
+            menu_item_rows = [
+                {
+                    "category_id": categories[category],
+                    "name": name,
+                    "description": description,
+                    "base_price_usd": price,
+                    "is_active": True,
+                }
+                for category, name, description, price in MENU_ITEMS
+            ]
+            menu_item_insert = insert_ignoring_duplicates(
+                MenuItem.__table__, ["category_id", "name"]
+            )
+            if menu_item_insert is not None:
+                created_menu_items = set(
+                    db.session.execute(
+                        menu_item_insert.returning(MenuItem.category_id, MenuItem.name),
+                        menu_item_rows,
+                    ).tuples()
+                )
             else:
-                print(f"Menu item already exists: {item_data['name']}")
-        
-        # Commit all changes
-        db.session.commit()
-        print("\n✅ Coffee shop menu seeding completed successfully!")
-        print(f"Categories: {len(categories_data)}")
-        print(f"Ingredients: {len(ingredients_data)}")
-        print(f"Menu Items: {len(menu_items_data)}")
+                existing_menu_items = set(
+                    db.session.execute(
+                        select(MenuItem.category_id, MenuItem.name).where(
+                            tuple_(MenuItem.category_id, MenuItem.name).in_(
+                                [(row["category_id"], row["name"]) for row in menu_item_rows]
+                            )
+                        )
+                    ).tuples()
+                )
+                new_menu_items = [
+                    row for row in menu_item_rows
+                    if (row["category_id"], row["name"]) not in existing_menu_items
+                ]
+                if new_menu_items:
+                    db.session.execute(insert(MenuItem.__table__), new_menu_items)
+                created_menu_items = {(row["category_id"], row["name"]) for row in new_menu_items}
+            for row in menu_item_rows:
+                if (row["category_id"], row["name"]) in created_menu_items:
+                    details.append(f"Created menu item: {row['name']} (${row['base_price_usd']})")
+                else:
+                    details.append(f"Menu item already exists: {row['name']}")
+
+        if os.environ.get("SEED_VERBOSE"):
+            sys.stdout.write("\n".join(details) + "\n")
+        print(
+            "\n✅ Coffee shop menu seeding completed successfully!\n"
+            f"Categories: {len(CATEGORIES)}\n"
+            f"Ingredients: {len(INGREDIENTS)}\n"
+            f"Menu Items: {len(MENU_ITEMS)}"
+        )
 
 if __name__ == "__main__":
     main()
@@ -28,28 +28,27 @@ def test_menu_update():
         test_data = {"name": "Updated Espresso", "description": "Premium espresso shot"}
         
         # Simulate the fixed update logic
-        allowed_fields = {'category_id', 'name', 'description', 'base_price_usd', 'is_active', 'image_url'}
-        protected_fields = ["id", "created_at", "updated_at"]
+        allowed_fields = frozenset({'category_id', 'name', 'description', 'base_price_usd', 'is_active', 'image_url'})
+        protected_fields = frozenset({"id", "created_at", "updated_at"})
+        required_fields = frozenset({'category_id', 'base_price_usd'})
+        # allowed_fields is authoritative, so no per-key hasattr check is needed
+        to_update = (test_data.keys() & allowed_fields) - protected_fields
         update_fields = []
         
         for key, value in test_data.items():
-            if key in protected_fields:
-                print(f"Ignoring protected field: {key}")
+            if key not in to_update:
+                reason = "protected" if key in protected_fields else "unknown"
+                print(f"Ignoring {reason} field: {key}")
                 continue
-            
-            if key not in allowed_fields:
-                print(f"Ignoring unknown field: {key}")
+                
+            if key in required_fields and value is None:
+                print(f"Ignoring attempt to set required field {key} to None")
                 continue
                 
-            if hasattr(item, key):
-                if key in ['category_id', 'base_price_usd'] and value is None:
-                    print(f"Ignoring attempt to set required field {key} to None")
-                    continue
-                    
-                old_value = getattr(item, key)
-                setattr(item, key, value)
-                update_fields.append(key)
-                print(f"Updated {key}: '{old_value}' -> '{value}'")
+            old_value = getattr(item, key)
+            setattr(item, key, value)
+            update_fields.append(key)
+            print(f"Updated {key}: '{old_value}' -> '{value}'")
         
         print(f"Updated fields: {update_fields}")
         print(f"Final: name='{item.name}', description='{item.description}'")
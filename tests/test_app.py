@@ -5,9 +5,9 @@ import pytest
 from app import create_app, db
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def app():
-    """Create application for testing."""
+    """Create application for testing; the schema is built once per session."""
     app = create_app("testing")
     with app.app_context():
         db.create_all()
@@ -15,7 +15,7 @@ def app():
         db.drop_all()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client(app):
     """Create test client."""
     return app.test_client()
@@ -0,0 +1,96 @@
+"""
+Tests for the payment status update script
+"""
+import pytest
+from sqlalchemy import create_engine, event, text
+
+import update_payment_status
+
+
+ORDER_STATUSES = ["completed", "pending_payment", "preparing", "ready_for_pickup", "cancelled"]
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """SQLite orders table without payment_status, run through the batched path."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'orders.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE orders (id INTEGER PRIMARY KEY, status TEXT)"))
+        connection.execute(
+            text("INSERT INTO orders (status) VALUES (:status)"),
+            [{"status": ORDER_STATUSES[i % len(ORDER_STATUSES)]} for i in range(20)],
+        )
+    monkeypatch.setattr(update_payment_status, "get_engine", lambda: engine)
+    monkeypatch.setattr(update_payment_status, "SINGLE_TRANSACTION_DIALECTS", frozenset())
+    monkeypatch.setattr(update_payment_status, "BACKFILL_BATCH_SIZE", 4)
+    yield engine
+    engine.dispose()
+
+
+def payment_statuses(engine):
+    with engine.connect() as connection:
+        return dict(
+            connection.execute(text("SELECT id, payment_status FROM orders")).all()
+        )
+
+
+def add_new_order(engine):
+    """Insert an order the way the app does after the migration."""
+    with engine.begin() as connection:
+        return connection.execute(
+            text(
+                "INSERT INTO orders (status) VALUES ('paid_waiting_preparation') "
+                "RETURNING id"
+            )
+        ).scalar()
+
+
+def expected_statuses(engine, max_id=20):
+    paid = {"completed", "preparing", "ready_for_pickup"}
+    with engine.connect() as connection:
+        rows = connection.execute(
+            text("SELECT id, status FROM orders WHERE id <= :max_id"), {"max_id": max_id}
+        ).all()
+    return {order_id: "paid" if status in paid else "pending" for order_id, status in rows}
+
+
+def test_batched_backfill(engine):
+    """Test that every batch is applied on a clean run."""
+    update_payment_status.update_database()
+    assert payment_statuses(engine) == expected_statuses(engine)
+
+
+def test_interrupted_backfill_resumes(engine):
+    """Test that a re-run finishes a backfill that failed partway through."""
+    batches = []
+
+    def fail_second_batch(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("UPDATE orders"):
+            batches.append(parameters)
+            if len(batches) == 2:
+                raise RuntimeError("connection dropped")
+
+    event.listen(engine, "before_cursor_execute", fail_second_batch)
+    with pytest.raises(SystemExit):
+        update_payment_status.update_database()
+    event.remove(engine, "before_cursor_execute", fail_second_batch)
+
+    partial = payment_statuses(engine)
+    assert partial != expected_statuses(engine)
+    assert "paid" in partial.values()
+
+    # Orders placed between the failed run and the re-run are not backfilled
+    new_order_id = add_new_order(engine)
+    update_payment_status.update_database()
+    statuses = payment_statuses(engine)
+    assert statuses.pop(new_order_id) == "pending"
+    assert statuses == expected_statuses(engine)
+
+
+def test_rerun_leaves_new_orders_alone(engine):
+    """Test that a re-run after a completed backfill changes nothing."""
+    update_payment_status.update_database()
+    new_order_id = add_new_order(engine)
+
+    update_payment_status.update_database()
+    assert payment_statuses(engine)[new_order_id] == "pending"
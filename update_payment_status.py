@@ -3,25 +3,81 @@
 This script adds the payment_status column to the orders table and updates
 existing records with appropriate status values.
 """
+import functools
 import os
 import sys
 import traceback
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, inspect, text
+
+from app.utils.sqlite_pragmas import set_sqlite_pragmas
 
 # Load environment variables
 load_dotenv()
 
+# Orders in these states have already been paid for
+PAID_ORDER_FILTER = (
+    "status IN ('completed', 'paid_waiting_preparation', 'preparing', 'ready_for_pickup')"
+)
+
+# Rows per transaction when backfilling on server databases
+BACKFILL_BATCH_SIZE = 5000
+
+# Dialects whose backfill runs in the ALTER TABLE's transaction; everything
+# else commits the column first and backfills in resumable batches
+SINGLE_TRANSACTION_DIALECTS = frozenset({"sqlite"})
+
+# Records the highest order id that existed when the column was added, so an
+# interrupted batched backfill resumes without touching orders created since.
+# Dropped once the backfill finishes.
+BACKFILL_MARKER_TABLE = "payment_status_backfill"
+
 
 def get_database_url():
     """Get database URL from environment or use default"""
     return os.getenv("DATABASE_URL", "sqlite:///instance/pos_system_v01.db")
 
 
+@functools.lru_cache(maxsize=1)
+def get_engine():
+    """Build the engine once per process so repeated updates reuse its pool."""
+    engine = create_engine(get_database_url(), pool_pre_ping=True)
+    if engine.dialect.name == "sqlite":
+        # Set on connect: journal_mode cannot change inside the update transaction
+        event.listen(engine, "connect", set_sqlite_pragmas)
+    return engine
+
+
+def backfill_in_batches(connection, max_id):
+    """Backfill payment_status one primary key range per transaction.
+
+    Committing each range releases row locks early and keeps the redo/WAL
+    volume bounded on PostgreSQL or MySQL, where a single UPDATE over a large
+    orders table would hold every lock until it finished. Only rows still at
+    the 'pending' default are touched, so an interrupted run can be resumed
+    up to the same max_id.
+    """
+    update = text(
+        f"""
+        UPDATE orders
+        SET payment_status = 'paid'
+        WHERE id >= :low AND id < :high AND payment_status = 'pending'
+        AND {PAID_ORDER_FILTER};
+    """
+    )
+    for low in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+        high = min(low + BACKFILL_BATCH_SIZE, max_id + 1)
+        with connection.begin():
+            connection.execute(update, {"low": low, "high": high})
+
+
 def update_database():
-    """Update database with payment status column and set initial values."""
-    db_url = get_database_url()
-    engine = create_engine(db_url)
+    """Update database with payment status column and set initial values.
+
+    Statements without bound parameters go straight to the driver via
+    exec_driver_sql; only the batched backfill and its marker row use text().
+    """
+    engine = get_engine()
 
     try:
         with engine.connect() as connection:
@@ -29,48 +85,70 @@ def update_database():
                 print("Starting database update...")
 
                 # 1. Check if payment_status already exists
-                columns_result = connection.execute(
-                    text("PRAGMA table_info(orders);")
-                ).fetchall()
-                column_names = [col[1] for col in columns_result]
+                column_names = {
+                    col["name"] for col in inspect(connection).get_columns("orders")
+                }
 
-                if "payment_status" in column_names:
-                    print("Payment status column already exists. No changes needed.")
-                    return
+                batched = connection.dialect.name not in SINGLE_TRANSACTION_DIALECTS
 
-                # 2. Add the column directly to the existing table
-                print("Adding payment_status column...")
-                connection.execute(
-                    text(
+                if "payment_status" in column_names:
+                    # Only a batched run that stopped partway leaves the marker
+                    if not inspect(connection).has_table(BACKFILL_MARKER_TABLE):
+                        print("Payment status column already exists. No changes needed.")
+                        return
+                    print("Payment status column already exists. Resuming backfill...")
+                    max_id = connection.exec_driver_sql(
+                        f"SELECT max_id FROM {BACKFILL_MARKER_TABLE};"
+                    ).scalar()
+                else:
+                    # 2. Add the column directly to the existing table
+                    print("Adding payment_status column...")
+                    connection.exec_driver_sql(
                         """
-                    ALTER TABLE orders 
-                    ADD COLUMN payment_status TEXT 
-                    DEFAULT 'pending' 
-                    CHECK (payment_status IN ('pending', 'paid', 'refunded', 'failed', 'partially_refunded'));
-                """
+                        ALTER TABLE orders 
+                        ADD COLUMN payment_status TEXT 
+                        DEFAULT 'pending' 
+                        CHECK (payment_status IN ('pending', 'paid', 'refunded', 'failed', 'partially_refunded'));
+                    """
                     )
-                )
 
-                # 3. Update payment status for existing orders
-                print("Updating payment statuses...")
-                connection.execute(
-                    text(
+                    # 3. Update payment status for existing orders. SQLite
+                    # locks the whole database anyway, so backfill in this
+                    # transaction.
+                    if not batched:
+                        print("Updating payment statuses...")
+                        connection.exec_driver_sql(
+                            f"""
+                            UPDATE orders 
+                            SET payment_status = 'paid' 
+                            WHERE {PAID_ORDER_FILTER};
                         """
-                    UPDATE orders 
-                    SET payment_status = 'paid' 
-                    WHERE status IN ('completed', 'paid_waiting_preparation', 'preparing', 'ready_for_pickup');
-                """
-                    )
-                )
+                        )
+                    else:
+                        max_id = connection.exec_driver_sql(
+                            "SELECT MAX(id) FROM orders;"
+                        ).scalar()
+                        connection.exec_driver_sql(
+                            f"CREATE TABLE {BACKFILL_MARKER_TABLE} (max_id INTEGER);"
+                        )
+                        connection.execute(
+                            text(f"INSERT INTO {BACKFILL_MARKER_TABLE} (max_id) VALUES (:max_id)"),
+                            {"max_id": max_id},
+                        )
+
+            if batched:
+                if max_id is not None:
+                    print("Updating payment statuses in batches...")
+                    backfill_in_batches(connection, max_id)
+                with connection.begin():
+                    connection.exec_driver_sql(f"DROP TABLE {BACKFILL_MARKER_TABLE};")
 
-                print("Database update completed successfully!")
+            print("Database update completed successfully!")
 
     except Exception as e:
         print(f"Error updating database: {e}")
         traceback.print_exc()
         sys.exit(1)
-    finally:
-        engine.dispose()
 
 
 if __name__ == "__main__":